@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from contextlib import contextmanager
 import os
+from arq.connections import RedisSettings
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
@@ -15,6 +16,15 @@ POSTGRES_DB = os.getenv("PGDATABASE", "assignment")
 DATABASE_URL = (
     f"postgresql+psycopg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 )
+# Plain libpq-style DSN for the asyncpg pool used by latency-sensitive endpoints
+ASYNCPG_DSN = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+# Redis backing the arq report queue (shared by the API and app/worker.py)
+REDIS_SETTINGS = RedisSettings(
+    host=os.getenv("REDIS_HOST", "localhost"),
+    port=int(os.getenv("REDIS_PORT", "6379")),
+    database=int(os.getenv("REDIS_DB", "0")),
+)
 
 
 class Base(DeclarativeBase):
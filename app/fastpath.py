@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def _bisect_right(ts: np.ndarray, point: int) -> int:
+    # Index of the first observation strictly after point
+    lo = 0
+    hi = ts.size
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if ts[mid] <= point:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+@njit(cache=True, fastmath=True)
+def compute_uptime(
+    ts: np.ndarray, active: np.ndarray, iv_starts: np.ndarray, iv_ends: np.ndarray
+) -> Tuple[float, float]:
+    # ts: sorted int32 milliseconds since the report base, active: uint8 flags
+    # (one per observation), iv_starts/iv_ends: int32 business-interval bounds in
+    # the same unit. Sums are accumulated in int64.
+    # Status is piecewise-constant between observations; before the first
+    # observation it is taken from the first one.
+    # Return uptime_seconds, downtime_seconds summed over all intervals.
+    n = ts.size
+    if n == 0:
+        return 0.0, 0.0
+
+    up = np.int64(0)
+    total = np.int64(0)
+    for i in range(iv_starts.size):
+        start = iv_starts[i]
+        end = iv_ends[i]
+        total += end - start
+
+        k = _bisect_right(ts, start)
+        status = active[k - 1] if k > 0 else active[0]
+        current = start
+        while k < n and ts[k] < end:
+            if status:
+                up += ts[k] - current
+            current = ts[k]
+            status = active[k]
+            k += 1
+        if status:
+            up += end - current
+
+    return up / 1e3, (total - up) / 1e3
+
+
+def warm_up() -> None:
+    # Compile (or load from cache) ahead of the first report
+    one = np.zeros(1, dtype=np.int32)
+    compute_uptime(one, np.ones(1, dtype=np.uint8), one, one + 1)
@@ -1,15 +1,93 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, TextIO, Tuple
 import csv
+import os
+import re
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from sqlalchemy.dialects.postgresql import insert as pg_insert
-from datetime import datetime, timezone
-
-from .models import Observation, BusinessHour, StoreTimezone
-
-
-DATA_DIR = Path("data")
+from datetime import datetime, timedelta, timezone
+
+from .models import Observation
+from .obs_cache import observation_cache_is_current, write_observation_cache
+
+
+# Absolute, so API and worker processes agree on it whatever their working
+# directory; point it at shared storage when workers run on other hosts
+DATA_DIR = Path(os.getenv("DATA_DIR", "data")).resolve()
+OBSERVATIONS_CSV = DATA_DIR / "store_status.csv"
+
+# store_status.csv timestamps are always UTC ("YYYY-MM-DD HH:MM:SS[.ffffff] UTC"),
+# so anything matching this shape can be built directly as a naive UTC datetime.
+_TS_RE = re.compile(r"(\d{4})-(\d\d)-(\d\d)[ T](\d\d):(\d\d):(\d\d)(?:\.(\d+))?(?: ?UTC|Z)?")
+
+
+def _csv_rows(f: TextIO) -> Tuple[Dict[str, int], Iterator[List[str]]]:
+    # Plain csv.reader plus a header -> column index map (no per-row dicts)
+    reader = csv.reader(f)
+    header = next(reader, [])
+    return {name.strip(): i for i, name in enumerate(header)}, reader
+
+
+def _copy_into_stage(
+    session: Session,
+    stage: str,
+    columns: str,
+    rows: Iterable[Sequence[object]],
+    merge_sql: str,
+    before_merge: Callable[[Session], None] | None = None,
+) -> None:
+    # Stream rows into a session-private TEMP staging table with COPY FROM STDIN,
+    # then merge into the target table with a single INSERT ... SELECT ... ON CONFLICT.
+    # The stage disappears with the load's transaction.
+    conn = session.connection().connection
+    with conn.cursor() as cur:
+        cur.execute(f"CREATE TEMP TABLE {stage} ({columns}) ON COMMIT DROP")
+        with cur.copy(f"COPY {stage} FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        if before_merge is not None:
+            before_merge(session)
+        cur.execute(merge_sql)
+
+
+def _create_observation_partitions(session: Session) -> None:
+    # One RANGE partition per week (Monday-aligned) covering the staged rows,
+    # plus a DEFAULT partition so stray timestamps never fail the insert.
+    session.execute(text("CREATE TABLE IF NOT EXISTS observations_default PARTITION OF observations DEFAULT"))
+    first_week, last_ts = session.execute(
+        text("SELECT date_trunc('week', MIN(timestamp_utc)), MAX(timestamp_utc) FROM obs_stage")
+    ).one()
+    week = first_week
+    while week is not None and week <= last_ts:
+        next_week = week + timedelta(days=7)
+        session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS observations_w{week:%Y%m%d} PARTITION OF observations "
+                f"FOR VALUES FROM ('{week:%Y-%m-%d}') TO ('{next_week:%Y-%m-%d}')"
+            )
+        )
+        week = next_week
+
+
+def _cluster_observations(session: Session) -> None:
+    # Partitioned tables cannot be marked clustered; cluster each partition on
+    # its copy of the covering index instead.
+    leaves = session.execute(
+        text(
+            """
+            SELECT t.relname, i.relname
+            FROM pg_partition_tree('uq_store_timestamp') p
+            JOIN pg_class i ON i.oid = p.relid
+            JOIN pg_index x ON x.indexrelid = p.relid
+            JOIN pg_class t ON t.oid = x.indrelid
+            WHERE p.isleaf
+            """
+        )
+    ).all()
+    for table_name, index_name in leaves:
+        session.execute(text(f'CLUSTER "{table_name}" USING "{index_name}"'))
 
 
 def load_csvs_if_needed(session: Session) -> None:
@@ -17,9 +95,13 @@ def load_csvs_if_needed(session: Session) -> None:
     # If observations already exist, assume data was loaded
     any_obs = session.query(Observation).first()
     if any_obs is not None:
+        # Databases loaded before the cache existed, or whose CSV changed since,
+        # get it (re)built from the rows already in the database
+        if not observation_cache_is_current(OBSERVATIONS_CSV):
+            write_observation_cache(session, OBSERVATIONS_CSV)
         return
 
-    obs_path = DATA_DIR / "store_status.csv"
+    obs_path = OBSERVATIONS_CSV
     # Accept alternate filenames from dataset variants
     bh_path = DATA_DIR / "business_hours.csv"
     if not bh_path.exists():
@@ -39,6 +121,13 @@ def load_csvs_if_needed(session: Session) -> None:
     # Observations
     def parse_ts_utc(value: str) -> datetime:
         v = value.strip()
+        m = _TS_RE.fullmatch(v)
+        if m is not None:
+            frac = m[7] or "0"
+            return datetime(
+                int(m[1]), int(m[2]), int(m[3]), int(m[4]), int(m[5]), int(m[6]), int(frac[:6].ljust(6, "0"))
+            )
+        # Explicit offsets or unexpected shapes: general-purpose parsing
         if v.endswith("Z"):
             v = v.replace("Z", "+00:00")
         try:
@@ -56,20 +145,26 @@ def load_csvs_if_needed(session: Session) -> None:
         return dt
 
     with obs_path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = []
-        for row in reader:
-            rows.append(
-                {
-                    "store_id": str(row["store_id"]).strip(),
-                    "timestamp_utc": parse_ts_utc(str(row["timestamp_utc"])),
-                    "status": str(row["status"]).strip().lower(),
-                }
-            )
-    if rows:
-        stmt = pg_insert(Observation).values(rows)
-        stmt = stmt.on_conflict_do_nothing(index_elements=[Observation.store_id, Observation.timestamp_utc])
-        session.execute(stmt)
+        cols, reader = _csv_rows(f)
+        i_store, i_ts, i_status = cols["store_id"], cols["timestamp_utc"], cols["status"]
+        _copy_into_stage(
+            session,
+            "obs_stage",
+            "store_id text, timestamp_utc timestamp, status text",
+            (
+                (row[i_store].strip(), parse_ts_utc(row[i_ts]), row[i_status].strip().lower())
+                for row in reader
+            ),
+            """
+            INSERT INTO observations (store_id, timestamp_utc, status)
+            SELECT store_id, timestamp_utc, status::status_enum FROM obs_stage
+            ON CONFLICT (store_id, timestamp_utc) DO NOTHING
+            """,
+            before_merge=_create_observation_partitions,
+        )
+    # Keep the heap in (store_id, timestamp_utc) order so report scans stay local
+    _cluster_observations(session)
+    session.execute(text("ANALYZE observations"))
 
     # Business hours
     def parse_time(val: str):
@@ -82,48 +177,44 @@ def load_csvs_if_needed(session: Session) -> None:
         raise ValueError(f"Unrecognized time format: {val}")
 
     with bh_path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        bh_rows: list[dict] = []
-        for row in reader:
-            bh_rows.append(
-                {
-                    "store_id": str(row["store_id"]).strip(),
-                    "day_of_week": int(row.get("dayOfWeek") or row.get("day_of_week")),
-                    "start_time_local": parse_time(str(row["start_time_local"])),
-                    "end_time_local": parse_time(str(row["end_time_local"])),
-                }
-            )
-    if bh_rows:
-        stmt = pg_insert(BusinessHour).values(bh_rows)
-        stmt = stmt.on_conflict_do_nothing(
-            index_elements=[
-                BusinessHour.store_id,
-                BusinessHour.day_of_week,
-                BusinessHour.start_time_local,
-                BusinessHour.end_time_local,
-            ]
+        cols, reader = _csv_rows(f)
+        i_store = cols["store_id"]
+        i_dow = cols["dayOfWeek"] if "dayOfWeek" in cols else cols["day_of_week"]
+        i_start, i_end = cols["start_time_local"], cols["end_time_local"]
+        _copy_into_stage(
+            session,
+            "bh_stage",
+            "store_id text, day_of_week integer, start_time_local time, end_time_local time",
+            (
+                (row[i_store].strip(), int(row[i_dow]), parse_time(row[i_start]), parse_time(row[i_end]))
+                for row in reader
+            ),
+            """
+            INSERT INTO business_hours (store_id, day_of_week, start_time_local, end_time_local)
+            SELECT store_id, day_of_week, start_time_local, end_time_local FROM bh_stage
+            ON CONFLICT (store_id, day_of_week, start_time_local, end_time_local) DO NOTHING
+            """,
         )
-        session.execute(stmt)
 
     # Timezones
     with tz_path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        tz_rows: list[dict] = []
-        for row in reader:
-            tz_rows.append(
-                {
-                    "store_id": str(row["store_id"]).strip(),
-                    "timezone_str": str(row.get("timezone_str") or "America/Chicago"),
-                }
-            )
-    if tz_rows:
-        stmt = pg_insert(StoreTimezone).values(tz_rows)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=[StoreTimezone.store_id],
-            set_={"timezone_str": stmt.excluded.timezone_str},
+        cols, reader = _csv_rows(f)
+        i_store, i_tz = cols["store_id"], cols.get("timezone_str")
+        _copy_into_stage(
+            session,
+            "tz_stage",
+            "store_id text, timezone_str text",
+            (
+                (row[i_store].strip(), (row[i_tz] if i_tz is not None else "") or "America/Chicago")
+                for row in reader
+            ),
+            """
+            INSERT INTO store_timezones (store_id, timezone_str)
+            SELECT store_id, timezone_str FROM tz_stage
+            ON CONFLICT (store_id) DO UPDATE SET timezone_str = EXCLUDED.timezone_str
+            """,
         )
-        session.execute(stmt)
 
     session.commit()
-
-
+    # Columnar copy of the observations for report generation
+    write_observation_cache(session, obs_path)
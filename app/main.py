@@ -1,14 +1,13 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException
-from fastapi.responses import StreamingResponse, PlainTextResponse
+import asyncpg
+from arq import create_pool
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, PlainTextResponse
 from sqlalchemy.orm import Session
 from pathlib import Path
-import io
 import uuid
-from datetime import datetime
 
-from .db import Base, engine, get_session, ensure_database_exists
+from .db import ASYNCPG_DSN, REDIS_SETTINGS, Base, engine, get_session, ensure_database_exists
 from . import models
-from .report import generate_report
 from .loader import load_csvs_if_needed
 
 
@@ -22,37 +21,47 @@ def on_startup() -> None:
     Base.metadata.create_all(bind=engine)
 
 
-@app.post("/trigger_report")
-def trigger_report(background_tasks: BackgroundTasks) -> dict:
-    with get_session() as session:
-        report_id = str(uuid.uuid4())
-        report = models.Report(
-            id=report_id,
-            status="Running",
-            created_at=datetime.utcnow(),
-        )
-        session.add(report)
-        session.commit()
+@app.on_event("startup")
+async def open_pg_pool() -> None:
+    app.state.pg_pool = await asyncpg.create_pool(ASYNCPG_DSN, min_size=2, max_size=20)
 
-        # Ensure data is loaded before computing
-        background_tasks.add_task(_run_generation_task, report_id)
 
-    return {"report_id": report_id}
+@app.on_event("startup")
+async def open_arq_pool() -> None:
+    app.state.arq = await create_pool(REDIS_SETTINGS)
 
 
-def _run_generation_task(report_id: str) -> None:
-    # Load data and run generation in the same DB session
-    with get_session() as session:
-        try:
-            load_csvs_if_needed(session)
-            generate_report(session, report_id)
-        except Exception as exc:  # noqa: BLE001 - top-level task guard
-            # Mark report as failed
-            rep: models.Report | None = session.get(models.Report, report_id)
-            if rep is not None:
-                rep.status = "Failed"
-                rep.error_message = f"{type(exc).__name__}: {exc}"
-                session.commit()
+@app.on_event("shutdown")
+async def close_pg_pool() -> None:
+    await app.state.pg_pool.close()
+
+
+@app.on_event("shutdown")
+async def close_arq_pool() -> None:
+    await app.state.arq.close()
+
+
+@app.post("/trigger_report")
+async def trigger_report(request: Request) -> dict:
+    report_id = str(uuid.uuid4())
+    # Single round-trip on the event loop; no sync session or thread-pool hop
+    await request.app.state.pg_pool.execute(
+        "INSERT INTO reports (id, status, created_at) VALUES ($1, 'Running', now() AT TIME ZONE 'utc')",
+        report_id,
+    )
+
+    # Loading and generation run on an arq worker (see app/worker.py)
+    try:
+        await request.app.state.arq.enqueue_job("gen", report_id)
+    except Exception as exc:  # noqa: BLE001 - row must not stay Running
+        await request.app.state.pg_pool.execute(
+            "UPDATE reports SET status = 'Failed', error_message = $2 WHERE id = $1",
+            report_id,
+            f"{type(exc).__name__}: {exc}",
+        )
+        raise HTTPException(status_code=503, detail="Report queue unavailable") from exc
+
+    return {"report_id": report_id}
 
 
 @app.post("/load_data")
@@ -77,12 +86,14 @@ def get_report(report_id: str):
         if not path.exists():
             raise HTTPException(status_code=500, detail="Report file missing")
 
-        buf = io.BytesIO(path.read_bytes())
-        headers = {
-            "X-Report-Status": "Complete",
-            "Content-Disposition": f"attachment; filename={path.name}",
-        }
-        return StreamingResponse(buf, media_type="text/csv", headers=headers)
+        # Sent straight from disk (sendfile where available); Content-Length and
+        # Content-Disposition come from the file's stat and name
+        return FileResponse(
+            path,
+            media_type="text/csv",
+            filename=path.name,
+            headers={"X-Report-Status": "Complete"},
+        )
 
 
 @app.get("/debug_report")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, time
-from sqlalchemy import String, Integer, DateTime, Time, Enum, UniqueConstraint
+from sqlalchemy import String, Integer, DateTime, Time, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .db import Base
@@ -11,12 +11,17 @@ class Observation(Base):
     __tablename__ = "observations"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    store_id: Mapped[str] = mapped_column(String, index=True)
-    timestamp_utc: Mapped[datetime] = mapped_column(DateTime(timezone=False), index=True)
-    status: Mapped[str] = mapped_column(Enum("active", "inactive", name="status_enum"), index=True)
+    store_id: Mapped[str] = mapped_column(String)
+    # Part of the primary key because the table is partitioned on it
+    timestamp_utc: Mapped[datetime] = mapped_column(DateTime(timezone=False), primary_key=True)
+    status: Mapped[str] = mapped_column(Enum("active", "inactive", name="status_enum"))
 
     __table_args__ = (
-        UniqueConstraint("store_id", "timestamp_utc", name="uq_store_timestamp"),
+        # Enforces one row per (store, timestamp) for ON CONFLICT and covers the
+        # per-store time-range scans (index-only, status included)
+        Index("uq_store_timestamp", "store_id", "timestamp_utc", unique=True, postgresql_include=["status"]),
+        # Weekly RANGE partitions are created by the loader (see loader._create_observation_partitions)
+        {"postgresql_partition_by": "RANGE (timestamp_utc)"},
     )
 
 
@@ -24,8 +29,8 @@ class BusinessHour(Base):
     __tablename__ = "business_hours"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    store_id: Mapped[str] = mapped_column(String, index=True)
-    day_of_week: Mapped[int] = mapped_column(Integer, index=True)  # 0=Monday ... 6=Sunday
+    store_id: Mapped[str] = mapped_column(String)
+    day_of_week: Mapped[int] = mapped_column(Integer)  # 0=Monday ... 6=Sunday
     start_time_local: Mapped[time] = mapped_column(Time(timezone=False))
     end_time_local: Mapped[time] = mapped_column(Time(timezone=False))
 
@@ -37,6 +42,7 @@ class BusinessHour(Base):
             "end_time_local",
             name="uq_business_hour_unique_span",
         ),
+        Index("ix_bh_store_dow", "store_id", "day_of_week"),
     )
 
 
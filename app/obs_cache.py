@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+import os
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .models import Observation
+
+
+@dataclass
+class ObservationArrays:
+    # Every store's observations back to back, sorted by (store_id, timestamp)
+    ts: np.ndarray  # int64 epoch microseconds
+    active: np.ndarray  # uint8 flags
+    offsets: Dict[str, Tuple[int, int]]  # store_id -> [start, stop) slice
+
+
+def cache_path(source: Path) -> Path:
+    # Arrow IPC file next to the source CSV (memory-mappable, unlike Parquet)
+    return source.with_name("obs.arrow")
+
+
+def _fingerprint(source: Path) -> bytes | None:
+    try:
+        st = source.stat()
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}".encode()
+
+
+def observation_cache_is_current(source: Path) -> bool:
+    # True when the cache exists and was built after the current source file
+    path = cache_path(source)
+    fingerprint = _fingerprint(source)
+    if fingerprint is None or not path.exists():
+        return False
+    with pa.memory_map(str(path)) as mm:
+        return (pa.ipc.open_file(mm).schema.metadata or {}).get(b"source") == fingerprint
+
+
+def write_observation_cache(session: Session, source: Path) -> None:
+    # Persist all observations as columnar arrays (dictionary-encoded store_id,
+    # int64 epoch-microsecond ts, uint8 active) sorted by (store_id, ts).
+    fingerprint = _fingerprint(source)
+    if fingerprint is None:
+        return
+    rows = session.execute(
+        select(Observation.store_id, Observation.timestamp_utc, Observation.status)
+        .order_by(Observation.store_id, Observation.timestamp_utc)
+        .execution_options(yield_per=10000)
+    )
+    store_ids: List[str] = []
+    timestamps: List[datetime] = []
+    statuses: List[bool] = []
+    for store_id, ts, status in rows:
+        store_ids.append(store_id)
+        timestamps.append(ts)
+        statuses.append(status == "active")
+
+    table = pa.Table.from_arrays(
+        [
+            pa.array(store_ids, type=pa.string()).dictionary_encode(),
+            pa.array(np.array(timestamps, dtype="datetime64[us]").astype(np.int64)),
+            pa.array(np.array(statuses, dtype=np.uint8)),
+        ],
+        names=["store_id", "ts", "active"],
+    ).replace_schema_metadata({"source": fingerprint})
+
+    path = cache_path(source)
+    # Unique temp file per writer: concurrent rebuilds each replace the cache
+    # atomically instead of racing on one shared temp name
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".arrow.tmp")
+    os.close(fd)
+    try:
+        with pa.OSFile(tmp_name, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def read_observation_cache(source: Path, start_utc: datetime, end_utc: datetime) -> ObservationArrays | None:
+    # Observations within [start_utc, end_utc] from the memory-mapped cache, or
+    # None when the cache is missing or was built from a different source file.
+    path = cache_path(source)
+    fingerprint = _fingerprint(source)
+    if fingerprint is None or not path.exists():
+        return None
+
+    start_us = np.datetime64(start_utc, "us").astype(np.int64)
+    end_us = np.datetime64(end_utc, "us").astype(np.int64)
+    with pa.memory_map(str(path)) as mm:
+        reader = pa.ipc.open_file(mm)
+        if (reader.schema.metadata or {}).get(b"source") != fingerprint:
+            return None
+        table = reader.read_all()
+        store_col = table.column("store_id").combine_chunks()
+        ts_all = table.column("ts").to_numpy()
+        # Boolean masking copies the window out of the mapping before it is closed
+        mask = (ts_all >= start_us) & (ts_all <= end_us)
+        ts = ts_all[mask]
+        active = table.column("active").to_numpy()[mask]
+        codes = store_col.indices.to_numpy()[mask]
+        names = store_col.dictionary.to_pylist()
+
+    # Rows are grouped by store, so each store is one run of equal codes
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate(([0], bounds)).tolist() if codes.size else []
+    stops = np.concatenate((bounds, [codes.size])).tolist() if codes.size else []
+    offsets = {names[codes[a]]: (a, b) for a, b in zip(starts, stops)}
+    return ObservationArrays(ts=ts, active=active, offsets=offsets)
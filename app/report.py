@@ -1,27 +1,74 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta, time
 from pathlib import Path
-from typing import Dict, List, Tuple
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterator, List, Tuple
+from multiprocessing.shared_memory import SharedMemory
 import csv
+import multiprocessing
+import os
 from zoneinfo import ZoneInfo
 
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, text
 
+from .fastpath import compute_uptime
+from .loader import OBSERVATIONS_CSV
+from .obs_cache import ObservationArrays, read_observation_cache
 from .models import Observation, BusinessHour, StoreTimezone, Report
-from .time_utils import Interval, local_times_to_utc_intervals, daterange_days, intersect_intervals
+from .time_utils import UTC, Interval, local_times_to_utc_intervals, daterange_days
 
 
 DEFAULT_TZ = ZoneInfo("America/Chicago")
+# "python" computes metrics in-process; "sql" aggregates them inside Postgres
+REPORT_ENGINE = os.getenv("REPORT_ENGINE", "python")
+# Worker processes for the python engine; small reports stay in-process
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", str(os.cpu_count() or 1)))
+_PARALLEL_MIN_STORES = 1000
+# Report processes and their pools are started by a fork server (spawn where
+# that is unavailable), never by fork: forking a multi-threaded process such as
+# the arq worker can hand a child a lock held by another thread
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+# Where report CSVs are written; must be readable by the API, which serves
+# Report.file_path (stored absolute) from its own filesystem
+REPORTS_DIR = Path(os.getenv("REPORTS_DIR", "reports")).resolve()
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+_SECOND_US = 1_000_000
+_DAY_US = 86_400 * _SECOND_US
+# 23:59:59.999 local, where the first half of a span wrapping past midnight ends
+_WRAP_END_US = _DAY_US - 1_000
+# 00:00:00-23:59:59 for days without business hours
+_FULL_DAY_SPANS = [(0, 86_399)]
+
+
+REPORT_COLUMNS = (
+    "store_id",
+    "uptime_last_hour(in minutes)",
+    "uptime_last_day(in hours)",
+    "update_last_week(in hours)",
+    "downtime_last_hour(in minutes)",
+    "downtime_last_day(in hours)",
+    "downtime_last_week(in hours)",
+)
+# Per-store metric values, in REPORT_COLUMNS order after store_id
+StoreMetrics = Tuple[float, float, float, float, float, float]
 
 
 @dataclass
 class StoreConfig:
     timezone: ZoneInfo
-    business_hours_by_dow: Dict[int, List[Tuple[time, time]]]
+    # Local business-hour spans as (start, end) seconds of day, keyed by weekday
+    business_hours_by_dow: Dict[int, List[Tuple[int, int]]]
 
 
 def _get_reference_now(session: Session) -> datetime:
@@ -33,99 +80,162 @@ def _get_reference_now(session: Session) -> datetime:
     return max_dt
 
 
+@lru_cache(maxsize=512)
+def _get_zone(timezone_str: str) -> ZoneInfo:
+    # Each distinct IANA name is parsed once per process
+    try:
+        return ZoneInfo(timezone_str)
+    except Exception:
+        return DEFAULT_TZ
+
+
 def _load_store_configs(session: Session) -> Dict[str, StoreConfig]:
     # timezones
     tz_map: Dict[str, ZoneInfo] = {}
-    for tz in session.query(StoreTimezone).all():
-        try:
-            tz_map[tz.store_id] = ZoneInfo(tz.timezone_str)
-        except Exception:
-            tz_map[tz.store_id] = DEFAULT_TZ
+    tz_rows = session.execute(
+        select(StoreTimezone.store_id, StoreTimezone.timezone_str).execution_options(yield_per=10000)
+    )
+    for store_id, timezone_str in tz_rows:
+        tz_map[store_id] = _get_zone(timezone_str)
 
     # business hours
-    bh_map: Dict[str, Dict[int, List[Tuple[time, time]]]] = defaultdict(lambda: defaultdict(list))
-    for bh in session.query(BusinessHour).all():
-        bh_map[bh.store_id][bh.day_of_week].append((bh.start_time_local, bh.end_time_local))
+    bh_map: Dict[str, Dict[int, List[Tuple[int, int]]]] = defaultdict(lambda: defaultdict(list))
+    bh_rows = session.execute(
+        select(
+            BusinessHour.store_id,
+            BusinessHour.day_of_week,
+            BusinessHour.start_time_local,
+            BusinessHour.end_time_local,
+        ).execution_options(yield_per=10000)
+    )
+    for store_id, day_of_week, start_local, end_local in bh_rows:
+        bh_map[store_id][day_of_week].append((_seconds_of_day(start_local), _seconds_of_day(end_local)))
 
     # For stores missing BH, assume 24x7; we will detect missing when computing per-day intervals
     configs: Dict[str, StoreConfig] = {}
-    store_ids = {sid for (sid,) in session.query(Observation.store_id).distinct()}
-    # Include stores present in BH or TZ tables even if no observations (edge-case)
-    store_ids.update([tzid.store_id for tzid in session.query(StoreTimezone).all()])
-    store_ids.update([bhid.store_id for bhid in session.query(BusinessHour.store_id).distinct()])
+    store_ids = {sid for (sid,) in session.execute(select(Observation.store_id).distinct())}
+    # Include stores present in BH or TZ tables even if no observations (edge-case);
+    # both maps were keyed by store while scanning, so no extra queries are needed
+    store_ids.update(tz_map)
+    store_ids.update(bh_map)
     for store_id in store_ids:
         tzinfo = tz_map.get(store_id, DEFAULT_TZ)
         configs[store_id] = StoreConfig(timezone=tzinfo, business_hours_by_dow=bh_map.get(store_id, {}))
     return configs
 
 
-def _business_intervals_utc(start_utc: datetime, end_utc: datetime, config: StoreConfig) -> List[Interval]:
-    intervals: List[Interval] = []
+def _load_all_observations(session: Session, start_utc: datetime, end_utc: datetime) -> ObservationArrays:
+    # One ordered scan for every store instead of a query per store
+    stmt = (
+        select(Observation.store_id, Observation.timestamp_utc, Observation.status)
+        .where(Observation.timestamp_utc >= start_utc)
+        .where(Observation.timestamp_utc <= end_utc)
+        .order_by(Observation.store_id, Observation.timestamp_utc)
+        .execution_options(yield_per=10000)
+    )
+    rows = session.execute(stmt)
+    timestamps: List[datetime] = []
+    statuses: List[bool] = []
+    offsets: Dict[str, Tuple[int, int]] = {}
+    for store_id, group in groupby(rows, key=itemgetter(0)):
+        start = len(timestamps)
+        for _, ts, status in group:
+            timestamps.append(ts)
+            statuses.append(status == "active")
+        offsets[store_id] = (start, len(timestamps))
+    return ObservationArrays(
+        ts=np.array(timestamps, dtype="datetime64[us]").astype(np.int64),
+        active=np.array(statuses, dtype=np.uint8),
+        offsets=offsets,
+    )
+
+
+def _business_intervals_utc(start_utc: datetime, end_utc: datetime, config: StoreConfig) -> Tuple[np.ndarray, np.ndarray]:
+    # Business intervals as int64 epoch-microsecond (starts, ends), clamped to [start_utc, end_utc]
+    starts: List[int] = []
+    ends: List[int] = []
     tz = config.timezone
 
-    for day_midnight_local in daterange_days(start_utc, end_utc, tz):
+    days = list(daterange_days(start_utc, end_utc, tz))
+    # One tz conversion per local midnight (plus two days ahead for wrapping spans)
+    midnights = [_epoch_us(days[0] + timedelta(days=i)) for i in range(len(days) + 2)] if days else []
+
+    for i, day_midnight_local in enumerate(days):
         day_dow = day_midnight_local.weekday()  # 0=Monday ... 6=Sunday
-        spans = config.business_hours_by_dow.get(day_dow)
-        if not spans or len(spans) == 0:
-            # If business hours missing for a store: assume 24x7
-            spans = [(time(0, 0, 0), time(23, 59, 59))]
-
-        day_intervals = local_times_to_utc_intervals(day_midnight_local, spans, tz)
-        # Clamp each to [start_utc, end_utc]
-        for iv in day_intervals:
-            clamped = iv.clamp(start_utc, end_utc)
-            if clamped is not None:
-                intervals.append(clamped)
-    return intervals
-
-
-def _interpolate_status(observations: List[Tuple[datetime, str]], window: Interval) -> Tuple[float, float]:
-    # Given observations sorted by time covering potentially sparse points,
-    # extrapolate piecewise-constant status across the window.
-    # Return uptime_seconds, downtime_seconds within window.
-    if not observations:
-        return 0.0, 0.0
-
-    uptime = 0.0
-    downtime = 0.0
-
-    # Start with the status at the first observation; assume it holds from window.start
-    idx = 0
-    current_time = window.start
-    current_status = observations[0][1]
-
-    # Advance to first obs within or after window.start; if earlier obs exist, take last before window.start
-    for t, s in observations:
-        if t <= window.start:
-            current_status = s
-            current_time = window.start
-            idx += 1
-        else:
-            break
-
-    # Iterate over remaining observations until window.end
-    all_points = [(t, s) for t, s in observations if (t > window.start and t < window.end)]
-    for t, s in all_points:
-        delta = (t - current_time).total_seconds()
-        if current_status == "active":
-            uptime += delta
-        else:
-            downtime += delta
-        current_time = t
-        current_status = s
-
-    # Tail from last point to window.end
-    delta_tail = (window.end - current_time).total_seconds()
-    if delta_tail > 0:
-        if current_status == "active":
-            uptime += delta_tail
-        else:
-            downtime += delta_tail
-
-    return uptime, downtime
-
-
-def _compute_store_metrics(session: Session, store_id: str, now_utc: datetime, config: StoreConfig) -> Dict[str, float]:
+        # If business hours missing for a store: assume 24x7
+        spans = config.business_hours_by_dow.get(day_dow) or _FULL_DAY_SPANS
+
+        midnight, next_midnight, day_after = midnights[i], midnights[i + 1], midnights[i + 2]
+        if next_midnight - midnight != _DAY_US or day_after - next_midnight != _DAY_US:
+            # DST transition today or tomorrow: the offset is not constant, convert each span
+            local_spans = [(_time_of_day(s), _time_of_day(e)) for s, e in spans]
+            for iv in local_times_to_utc_intervals(day_midnight_local, local_spans, tz):
+                starts.append(_epoch_us(iv.start))
+                ends.append(_epoch_us(iv.end))
+            continue
+
+        for s, e in spans:
+            if e <= s:
+                # Wrap past midnight
+                starts += (midnight + s * _SECOND_US, next_midnight)
+                ends += (midnight + _WRAP_END_US, next_midnight + e * _SECOND_US)
+            else:
+                starts.append(midnight + s * _SECOND_US)
+                ends.append(midnight + e * _SECOND_US)
+
+    # Clamp every interval to the window at once and drop the empty ones
+    clamped_starts = np.maximum(np.array(starts, dtype=np.int64), _epoch_us(start_utc))
+    clamped_ends = np.minimum(np.array(ends, dtype=np.int64), _epoch_us(end_utc))
+    keep = clamped_starts < clamped_ends
+    return clamped_starts[keep], clamped_ends[keep]
+
+
+@lru_cache(maxsize=4096)
+def _intervals_cached(
+    dow_signature: Tuple[Tuple[int, int, int], ...], tz_key: str, start_utc: datetime, end_utc: datetime
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Memoized _business_intervals_utc keyed by (weekday, start, end) spans; the
+    # returned arrays are shared between callers and therefore read-only.
+    business_hours_by_dow: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for dow, s, e in dow_signature:
+        business_hours_by_dow[dow].append((s, e))
+    config = StoreConfig(timezone=_get_zone(tz_key), business_hours_by_dow=business_hours_by_dow)
+    starts, ends = _business_intervals_utc(start_utc, end_utc, config)
+    starts.flags.writeable = False
+    ends.flags.writeable = False
+    return starts, ends
+
+
+def _epoch_us(dt: datetime) -> int:
+    # Naive UTC (or tz-aware) datetime -> integer microseconds since the Unix epoch
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(UTC).replace(tzinfo=None)
+    return (dt - _EPOCH) // _ONE_US
+
+
+def _seconds_of_day(t: time) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _time_of_day(seconds: int) -> time:
+    return time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def _time_base_us(now_utc: datetime) -> int:
+    # Origin of the 32-bit report timeline: start of the observation superset window
+    return _epoch_us(now_utc - timedelta(days=7, hours=2))
+
+
+def _quantize(values_us: np.ndarray, base_us: int) -> np.ndarray:
+    # Epoch microseconds -> int32 milliseconds since base_us; the ~7d+4h report
+    # span (6.2e8 ms) fits easily and halves the width searched by the kernel.
+    return ((values_us - base_us) // 1_000).astype(np.int32)
+
+
+def _compute_store_metrics(
+    ts: np.ndarray, active: np.ndarray, now_utc: datetime, config: StoreConfig
+) -> StoreMetrics:
+    # ts: int32 milliseconds since _time_base_us(now_utc)
     # Windows
     one_hour_start = now_utc - timedelta(hours=1)
     one_day_start = now_utc - timedelta(days=1)
@@ -137,82 +247,226 @@ def _compute_store_metrics(session: Session, store_id: str, now_utc: datetime, c
         "last_week": Interval(one_week_start, now_utc),
     }
 
-    # Fetch observations overlapping the last week window (superset)
-    obs_rows = (
-        session.query(Observation)
-        .filter(Observation.store_id == store_id)
-        .filter(Observation.timestamp_utc >= one_week_start - timedelta(hours=2))
-        .filter(Observation.timestamp_utc <= now_utc + timedelta(hours=2))
-        .order_by(Observation.timestamp_utc.asc())
-        .all()
+    base_us = _time_base_us(now_utc)
+    # Stores sharing a timezone and business hours share their UTC intervals
+    dow_signature = tuple(
+        sorted((dow, s, e) for dow, spans in config.business_hours_by_dow.items() for s, e in spans)
     )
-    observations = [(r.timestamp_utc, r.status) for r in obs_rows]
-
-    metrics: Dict[str, float] = {}
+    totals: Dict[str, Tuple[float, float]] = {}
     for key, win in windows.items():
-        business_intervals = _business_intervals_utc(win.start, win.end, config)
-        uptime_total = 0.0
-        downtime_total = 0.0
-        for iv in business_intervals:
-            # Interpolate using all observations but constrained to iv
-            # Intersect observation series to this interval by passing window
-            up, down = _interpolate_status(observations, iv)
-            uptime_total += up
-            downtime_total += down
-
-        if key == "last_hour":
-            # output in minutes
-            metrics["uptime_last_hour_min"] = uptime_total / 60.0
-            metrics["downtime_last_hour_min"] = downtime_total / 60.0
-        else:
-            # output in hours
-            suffix = "day" if key == "last_day" else "week"
-            metrics[f"uptime_last_{suffix}_hr"] = uptime_total / 3600.0
-            metrics[f"downtime_last_{suffix}_hr"] = downtime_total / 3600.0
-
-    return metrics
+        iv_starts, iv_ends = _intervals_cached(dow_signature, config.timezone.key, win.start, win.end)
+        # Uptime is additive over the business intervals: evaluate them in one pass
+        totals[key] = compute_uptime(ts, active, _quantize(iv_starts, base_us), _quantize(iv_ends, base_us))
+
+    return _store_metrics(totals["last_hour"], totals["last_day"], totals["last_week"])
+
+
+def _store_metrics(
+    last_hour: Tuple[float, float], last_day: Tuple[float, float], last_week: Tuple[float, float]
+) -> StoreMetrics:
+    # (uptime, downtime) seconds per window -> last hour in minutes, day/week in hours
+    return (
+        last_hour[0] / 60.0,
+        last_day[0] / 3600.0,
+        last_week[0] / 3600.0,
+        last_hour[1] / 60.0,
+        last_day[1] / 3600.0,
+        last_week[1] / 3600.0,
+    )
 
 
-def generate_report(session: Session, report_id: str) -> None:
-    now_utc = _get_reference_now(session)
+# Same semantics as the Python path, evaluated set-at-a-time in Postgres:
+# every store's business intervals for each window are generated from business_hours
+# (24x7 when a weekday has none) and intersected with piecewise-constant status
+# segments built with LAG/LEAD, so only one row per store comes back.
+_METRICS_SQL = text(
+    """
+    WITH stores AS (
+        SELECT store_id FROM observations
+        UNION SELECT store_id FROM store_timezones
+        UNION SELECT store_id FROM business_hours
+    ),
+    store_tz AS (
+        SELECT s.store_id, COALESCE(tzn.name, :default_tz) AS tz
+        FROM stores s
+        LEFT JOIN store_timezones st ON st.store_id = s.store_id
+        LEFT JOIN pg_timezone_names tzn ON tzn.name = st.timezone_str
+    ),
+    windows (win, win_start, win_end) AS (
+        VALUES
+            ('last_hour', CAST(:now AS timestamp) - interval '1 hour', CAST(:now AS timestamp)),
+            ('last_day', CAST(:now AS timestamp) - interval '1 day', CAST(:now AS timestamp)),
+            ('last_week', CAST(:now AS timestamp) - interval '7 days', CAST(:now AS timestamp))
+    ),
+    days AS (
+        SELECT t.store_id, t.tz, w.win, w.win_start, w.win_end, CAST(d AS date) AS day
+        FROM store_tz t
+        CROSS JOIN windows w
+        CROSS JOIN LATERAL generate_series(
+            CAST(CAST((w.win_start AT TIME ZONE 'UTC') AT TIME ZONE t.tz AS date) AS timestamp),
+            CAST(CAST((w.win_end AT TIME ZONE 'UTC') AT TIME ZONE t.tz AS date) AS timestamp),
+            interval '1 day'
+        ) AS d
+    ),
+    spans AS (
+        SELECT d.*, bh.start_time_local AS s, bh.end_time_local AS e
+        FROM days d
+        JOIN business_hours bh
+            ON bh.store_id = d.store_id AND bh.day_of_week = EXTRACT(ISODOW FROM d.day) - 1
+        UNION ALL
+        SELECT d.*, time '00:00:00', time '23:59:59'
+        FROM days d
+        WHERE NOT EXISTS (
+            SELECT 1 FROM business_hours bh
+            WHERE bh.store_id = d.store_id AND bh.day_of_week = EXTRACT(ISODOW FROM d.day) - 1
+        )
+    ),
+    local_intervals AS (
+        SELECT store_id, tz, win, win_start, win_end, day + s AS ls, day + e AS le
+        FROM spans WHERE e > s
+        UNION ALL
+        -- Wrap past midnight
+        SELECT store_id, tz, win, win_start, win_end, day + s, day + time '23:59:59.999'
+        FROM spans WHERE e <= s
+        UNION ALL
+        SELECT store_id, tz, win, win_start, win_end, CAST(day + 1 AS timestamp), (day + 1) + e
+        FROM spans WHERE e <= s
+    ),
+    intervals AS (
+        SELECT store_id, win,
+               GREATEST((ls AT TIME ZONE tz) AT TIME ZONE 'UTC', win_start) AS iv_start,
+               LEAST((le AT TIME ZONE tz) AT TIME ZONE 'UTC', win_end) AS iv_end
+        FROM local_intervals
+    ),
+    segments AS (
+        -- Status holds until the next observation; the first one also extends backwards
+        SELECT store_id, status,
+               CASE WHEN LAG(timestamp_utc) OVER w IS NULL THEN timestamp '-infinity' ELSE timestamp_utc END AS t0,
+               COALESCE(LEAD(timestamp_utc) OVER w, timestamp 'infinity') AS t1
+        FROM observations
+        WHERE timestamp_utc >= :obs_start AND timestamp_utc <= :obs_end
+        WINDOW w AS (PARTITION BY store_id ORDER BY timestamp_utc)
+    ),
+    overlap_seconds AS (
+        SELECT i.store_id, i.win, g.status,
+               EXTRACT(EPOCH FROM LEAST(g.t1, i.iv_end) - GREATEST(g.t0, i.iv_start)) AS seconds
+        FROM intervals i
+        JOIN segments g ON g.store_id = i.store_id AND g.t0 < i.iv_end AND g.t1 > i.iv_start
+        WHERE i.iv_start < i.iv_end
+    )
+    SELECT s.store_id,
+           COALESCE(SUM(o.seconds) FILTER (WHERE o.win = 'last_hour' AND o.status = 'active'), 0),
+           COALESCE(SUM(o.seconds) FILTER (WHERE o.win = 'last_hour' AND o.status = 'inactive'), 0),
+           COALESCE(SUM(o.seconds) FILTER (WHERE o.win = 'last_day' AND o.status = 'active'), 0),
+           COALESCE(SUM(o.seconds) FILTER (WHERE o.win = 'last_day' AND o.status = 'inactive'), 0),
+           COALESCE(SUM(o.seconds) FILTER (WHERE o.win = 'last_week' AND o.status = 'active'), 0),
+           COALESCE(SUM(o.seconds) FILTER (WHERE o.win = 'last_week' AND o.status = 'inactive'), 0)
+    FROM stores s
+    LEFT JOIN overlap_seconds o ON o.store_id = s.store_id
+    GROUP BY s.store_id
+    """
+)
+
+
+def _compute_metrics_sql(session: Session, now_utc: datetime) -> Iterator[Tuple[str, StoreMetrics]]:
+    result = session.execute(
+        _METRICS_SQL,
+        {
+            "now": now_utc,
+            "obs_start": now_utc - timedelta(days=7, hours=2),
+            "obs_end": now_utc + timedelta(hours=2),
+            "default_tz": DEFAULT_TZ.key,
+        },
+    )
+    for store_id, up_h, down_h, up_d, down_d, up_w, down_w in result:
+        yield store_id, _store_metrics(
+            (float(up_h), float(down_h)), (float(up_d), float(down_d)), (float(up_w), float(down_w))
+        )
+
+
+def _compute_metrics_python(session: Session, now_utc: datetime) -> Iterator[Tuple[str, StoreMetrics]]:
     configs = _load_store_configs(session)
+    # Observations overlapping the last week window (superset), bucketed by store;
+    # served from the columnar cache when it matches the loaded CSV
+    obs_start, obs_end = now_utc - timedelta(days=7, hours=2), now_utc + timedelta(hours=2)
+    observations = read_observation_cache(OBSERVATIONS_CSV, obs_start, obs_end)
+    if observations is None:
+        observations = _load_all_observations(session, obs_start, obs_end)
+    ts_all = _quantize(observations.ts, _time_base_us(now_utc))
+    store_ids = list(configs)
+    bounds = [observations.offsets.get(store_id, (0, 0)) for store_id in store_ids]
+
+    if REPORT_WORKERS <= 1 or len(store_ids) < _PARALLEL_MIN_STORES:
+        for store_id, (start, stop) in zip(store_ids, bounds):
+            ts, active = ts_all[start:stop], observations.active[start:stop]
+            yield store_id, _compute_store_metrics(ts, active, now_utc, configs[store_id])
+        return
+
+    # Stores are independent: fan out to worker processes that map the observation
+    # arrays from shared memory instead of receiving pickled copies.
+    ts_shm = SharedMemory(create=True, size=max(ts_all.nbytes, 1))
+    active_shm = SharedMemory(create=True, size=max(observations.active.nbytes, 1))
+    try:
+        np.ndarray(ts_all.shape, dtype=np.int32, buffer=ts_shm.buf)[:] = ts_all
+        np.ndarray(observations.active.shape, dtype=np.uint8, buffer=active_shm.buf)[:] = observations.active
+        chunksize = max(1, len(store_ids) // (4 * REPORT_WORKERS))
+        with ProcessPoolExecutor(
+            max_workers=REPORT_WORKERS,
+            mp_context=MP_CONTEXT,
+            initializer=_init_worker,
+            initargs=(ts_shm.name, active_shm.name, ts_all.size),
+        ) as executor:
+            results = executor.map(
+                _worker,
+                [start for start, _ in bounds],
+                [stop for _, stop in bounds],
+                [configs[store_id].timezone.key for store_id in store_ids],
+                [configs[store_id].business_hours_by_dow for store_id in store_ids],
+                [now_utc] * len(store_ids),
+                chunksize=chunksize,
+            )
+            yield from zip(store_ids, results)
+    finally:
+        ts_shm.close()
+        ts_shm.unlink()
+        active_shm.close()
+        active_shm.unlink()
+
+
+# Per-process views onto the parent's observation arrays (set by _init_worker)
+_shared: Dict[str, object] = {}
+
+
+def _init_worker(ts_name: str, active_name: str, size: int) -> None:
+    ts_shm = SharedMemory(name=ts_name)
+    active_shm = SharedMemory(name=active_name)
+    _shared["shm"] = (ts_shm, active_shm)
+    _shared["ts"] = np.ndarray((size,), dtype=np.int32, buffer=ts_shm.buf)
+    _shared["active"] = np.ndarray((size,), dtype=np.uint8, buffer=active_shm.buf)
+
+
+def _worker(
+    start: int, stop: int, tz_key: str, business_hours_by_dow: Dict[int, List[Tuple[int, int]]], now_utc: datetime
+) -> StoreMetrics:
+    config = StoreConfig(timezone=_get_zone(tz_key), business_hours_by_dow=business_hours_by_dow)
+    return _compute_store_metrics(_shared["ts"][start:stop], _shared["active"][start:stop], now_utc, config)
 
-    rows: List[Dict[str, object]] = []
-    for store_id, config in configs.items():
-        metrics = _compute_store_metrics(session, store_id, now_utc, config)
-        rows.append(
-            {
-                "store_id": store_id,
-                "uptime_last_hour(in minutes)": round(metrics.get("uptime_last_hour_min", 0.0), 2),
-                "uptime_last_day(in hours)": round(metrics.get("uptime_last_day_hr", 0.0), 2),
-                "update_last_week(in hours)": round(metrics.get("uptime_last_week_hr", 0.0), 2),
-                "downtime_last_hour(in minutes)": round(metrics.get("downtime_last_hour_min", 0.0), 2),
-                "downtime_last_day(in hours)": round(metrics.get("downtime_last_day_hr", 0.0), 2),
-                "downtime_last_week(in hours)": round(metrics.get("downtime_last_week_hr", 0.0), 2),
-            }
-        )
 
-    out_dir = Path("reports")
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"report_{report_id}.csv"
-    # Write CSV
-    if rows:
-        fieldnames = list(rows[0].keys())
+def generate_report(session: Session, report_id: str) -> None:
+    now_utc = _get_reference_now(session)
+    if REPORT_ENGINE == "sql":
+        metrics_by_store = _compute_metrics_sql(session, now_utc)
     else:
-        fieldnames = [
-            "store_id",
-            "uptime_last_hour(in minutes)",
-            "uptime_last_day(in hours)",
-            "update_last_week(in hours)",
-            "downtime_last_hour(in minutes)",
-            "downtime_last_day(in hours)",
-            "downtime_last_week(in hours)",
-        ]
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        metrics_by_store = _compute_metrics_python(session, now_utc)
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = REPORTS_DIR / f"report_{report_id}.csv"
+    # Stream rows to the CSV as each store's metrics are computed
+    with out_path.open("w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_COLUMNS)
+        for store_id, metrics in metrics_by_store:
+            writer.writerow((store_id, *(round(value, 2) for value in metrics)))
 
     rep: Report | None = session.get(Report, report_id)
     if rep is not None:
@@ -6,6 +6,9 @@ from typing import Iterable, List, Tuple
 from zoneinfo import ZoneInfo
 
 
+UTC = ZoneInfo("UTC")
+
+
 @dataclass(frozen=True)
 class Interval:
     start: datetime
@@ -24,8 +27,8 @@ class Interval:
 
 def daterange_days(start: datetime, end: datetime, tz: ZoneInfo) -> Iterable[datetime]:
     # Yield midnight-local (tz-aware) datetimes for each day touching [start, end)
-    start_aware_utc = start.replace(tzinfo=ZoneInfo("UTC"))
-    end_aware_utc = end.replace(tzinfo=ZoneInfo("UTC"))
+    start_aware_utc = start.replace(tzinfo=UTC)
+    end_aware_utc = end.replace(tzinfo=UTC)
     cur_local = start_aware_utc.astimezone(tz).replace(hour=0, minute=0, second=0, microsecond=0)
     end_local = end_aware_utc.astimezone(tz)
     while cur_local <= end_local:
@@ -50,18 +53,18 @@ def local_times_to_utc_intervals(
             # Wrap past midnight
             first = start_dt_local
             first_end = day_local_midnight.replace(hour=23, minute=59, second=59, microsecond=999000)
-            first_utc = first.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
-            first_end_utc = first_end.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+            first_utc = first.astimezone(UTC).replace(tzinfo=None)
+            first_end_utc = first_end.astimezone(UTC).replace(tzinfo=None)
             intervals.append(Interval(start=first_utc, end=first_end_utc))
             next_midnight = day_local_midnight + timedelta(days=1)
             second_start = next_midnight.replace(hour=0, minute=0, second=0, microsecond=0)
             second_end = end_dt_local + timedelta(days=1)
-            second_start_utc = second_start.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
-            second_end_utc = second_end.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+            second_start_utc = second_start.astimezone(UTC).replace(tzinfo=None)
+            second_end_utc = second_end.astimezone(UTC).replace(tzinfo=None)
             intervals.append(Interval(start=second_start_utc, end=second_end_utc))
         else:
-            start_utc = start_dt_local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
-            end_utc = end_dt_local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+            start_utc = start_dt_local.astimezone(UTC).replace(tzinfo=None)
+            end_utc = end_dt_local.astimezone(UTC).replace(tzinfo=None)
             intervals.append(Interval(start=start_utc, end=end_utc))
     return intervals
 
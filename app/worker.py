@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+from .db import REDIS_SETTINGS, get_session
+from . import models
+from .fastpath import warm_up
+from .report import MP_CONTEXT, generate_report
+from .loader import load_csvs_if_needed
+
+
+# Report generation can take far longer than arq's 5 minute default
+REPORT_JOB_TIMEOUT = int(os.getenv("REPORT_JOB_TIMEOUT", "3600"))
+# Reports run one at a time per worker by default: a large report already
+# spreads over REPORT_WORKERS processes, so N concurrent jobs fork N times that
+REPORT_MAX_JOBS = int(os.getenv("REPORT_MAX_JOBS", "1"))
+
+
+def _run_generation_task(report_id: str) -> None:
+    # Load data and run generation in the same DB session
+    with get_session() as session:
+        try:
+            load_csvs_if_needed(session)
+            generate_report(session, report_id)
+        except Exception as exc:  # noqa: BLE001 - top-level task guard
+            # Mark report as failed; roll back first so a DB-side error does not
+            # leave the session unusable (PendingRollbackError)
+            session.rollback()
+            rep: models.Report | None = session.get(models.Report, report_id)
+            if rep is not None:
+                rep.status = "Failed"
+                rep.error_message = f"{type(exc).__name__}: {exc}"
+                session.commit()
+
+
+def _mark_failed(report_id: str, message: str) -> None:
+    with get_session() as session:
+        rep: models.Report | None = session.get(models.Report, report_id)
+        if rep is not None and rep.status == "Running":
+            rep.status = "Failed"
+            rep.error_message = message
+            session.commit()
+
+
+async def gen(ctx: dict, report_id: str) -> None:
+    # The report runs in a child process, not a thread: on job_timeout arq
+    # cancels this coroutine and frees the job slot, and a thread cannot be
+    # stopped, so it would keep computing next to the following job.
+    proc = MP_CONTEXT.Process(target=_run_generation_task, args=(report_id,))
+    proc.start()
+    try:
+        # Joined off the event loop so the worker keeps its Redis heartbeat
+        await asyncio.to_thread(proc.join)
+    except asyncio.CancelledError:
+        proc.terminate()
+        await asyncio.to_thread(proc.join)
+        _mark_failed(report_id, f"Timed out after {REPORT_JOB_TIMEOUT} s")
+        raise
+    if proc.exitcode != 0:
+        # Killed from outside (e.g. OOM) before it could record the failure itself
+        _mark_failed(report_id, f"Report process exited with code {proc.exitcode}")
+
+
+async def startup(ctx: dict) -> None:
+    # Compile the uptime kernel into Numba's on-disk cache once per worker, so
+    # report processes load it instead of compiling it
+    warm_up()
+
+
+class WorkerSettings:
+    # Run with: arq app.worker.WorkerSettings
+    functions = [gen]
+    on_startup = startup
+    redis_settings = REDIS_SETTINGS
+    job_timeout = REPORT_JOB_TIMEOUT
+    max_jobs = REPORT_MAX_JOBS